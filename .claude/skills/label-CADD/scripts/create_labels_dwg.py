@@ -14,22 +14,28 @@ ezdxf cannot produce annotative MULTILEADER entities that fully work in AutoCAD
 command through AcCoreConsole, we get guaranteed compatibility.
 """
 
+import os
+import re
 import sys
+import csv
+import ctypes
 import json
 import argparse
+import functools
+import shutil
 import subprocess
 import tempfile
+import threading
 import time
 from pathlib import Path
 
-# AcCoreConsole paths to search (in order of preference)
-ACCORECONSOLE_PATHS = [
-    r"C:\Program Files\Autodesk\AutoCAD 2025\accoreconsole.exe",
-    r"C:\Program Files\Autodesk\AutoCAD 2024\accoreconsole.exe",
-    r"C:\Program Files\Autodesk\AutoCAD 2023\accoreconsole.exe",
-    r"C:\Program Files\Autodesk\AutoCAD LT 2025\accoreconsole.exe",
-    r"C:\Program Files\Autodesk\AutoCAD LT 2024\accoreconsole.exe",
-]
+try:
+    import orjson  # Optional: faster decisions.json parsing
+except ImportError:
+    orjson = None
+
+# Autodesk install root scanned for AutoCAD / AutoCAD LT installations
+AUTODESK_DIR = r"C:\Program Files\Autodesk"
 
 # Default template DWG (will be created from DXF on first use)
 DEFAULT_TEMPLATE = Path(__file__).parent.parent / "templates" / "mleader-template.dwg"
@@ -42,11 +48,64 @@ LISP_SCRIPT = Path(__file__).parent / "create_mleaders.lsp"
 COLOR_BYLAYER = 256
 COLOR_RED = 1
 
+# AcCoreConsole script template.
+# Uses SECURELOAD 0 to allow loading LISP from any path, then loads and runs the LISP script.
+ACCORE_SCRIPT_TEMPLATE = ''';;; AcCoreConsole script for MLEADER batch creation
+;;; Disable SECURELOAD to allow LISP loading from any path
+(setvar "SECURELOAD" 0)
+
+;;; Load the LISP script
+(load "{lisp_path}")
+
+;;; Create the labels with specified scale
+(c:MLEADER-BATCH "{csv_path}" "{output_dwg}" {scale})
+
+;;; Exit
+(command "._QUIT" "_Yes")
+'''
+
+# Manual SCR template (command-line syntax) for drag-drop into AutoCAD
+MANUAL_SCRIPT_TEMPLATE = ''';;; Manual script for MLEADER creation
+;;; Drag this file into AutoCAD with the template DWG open
+;;;
+;;; Steps:
+;;; 1. Open the template DWG in AutoCAD
+;;; 2. Drag this .scr file into the drawing window
+;;; 3. Wait for completion
+;;; 4. Check the output file location
+
+(load "{lisp_path}")
+(c:CREATE-MLEADERS "{csv_path}")
+_SAVEAS
+2018
+{output_dwg}
+
+'''
+
+
+def _install_rank(name):
+    """Sort key for install folders: full AutoCAD before LT, newest release first."""
+    year = re.search(r'\d{4}', name)
+    return ('LT' in name.split(), -int(year.group()) if year else 0)
+
 
+@functools.lru_cache(maxsize=1)
 def find_accoreconsole():
-    """Find AcCoreConsole executable."""
-    for path in ACCORECONSOLE_PATHS:
-        if Path(path).exists():
+    """Find AcCoreConsole executable.
+
+    Enumerates AUTODESK_DIR once instead of stat-ing a fixed list of paths,
+    so new releases are picked up without code changes.
+    """
+    try:
+        with os.scandir(AUTODESK_DIR) as entries:
+            installs = [e.name for e in entries
+                        if e.name.startswith('AutoCAD') and e.is_dir()]
+    except OSError:
+        return None
+
+    for name in sorted(installs, key=_install_rank):
+        path = os.path.join(AUTODESK_DIR, name, 'accoreconsole.exe')
+        if os.path.isfile(path):
             return path
     return None
 
@@ -63,16 +122,24 @@ def convert_decisions_to_csv(decisions_json, output_csv):
     Returns:
         Number of labels converted
     """
-    with open(decisions_json, 'r') as f:
-        decisions = json.load(f)
+    if orjson is not None:
+        with open(decisions_json, 'rb') as f:
+            decisions = orjson.loads(f.read())
+    else:
+        with open(decisions_json, 'r', encoding='utf-8') as f:
+            decisions = json.load(f)
 
     labels = decisions.get('labels', [])
     count = 0
 
     with open(output_csv, 'w', encoding='utf-8') as f:
+        # '\n' is translated to the platform newline by the text-mode file,
+        # matching what create_mleaders.lsp reads with read-line
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+
         # Write header
         f.write("# Labels CSV for AutoLISP MLEADER creation\n")
-        f.write("Point#,X,Y,Z,Label_Text,Type,Layer,Color\n")
+        writer.writerow(['Point#', 'X', 'Y', 'Z', 'Label_Text', 'Type', 'Layer', 'Color'])
 
         for label in labels:
             position = label.get('position')
@@ -99,56 +166,70 @@ def convert_decisions_to_csv(decisions_json, output_csv):
             else:
                 layer = 'G-ANNO'
                 color = COLOR_BYLAYER
-                label_text = label_text.upper()  # ALL CAPS for presentation
+                if not label_text.isupper():
+                    label_text = label_text.upper()  # ALL CAPS for presentation
 
-            # Escape commas in label text (wrap in quotes if needed)
-            if ',' in label_text:
-                label_text = f'"{label_text}"'
-
-            f.write(f"{point_num},{x},{y},{z},{label_text},{label_type},{layer},{color}\n")
+            # csv.writer quotes fields containing commas or quotes
+            writer.writerow([point_num, x, y, z, label_text, label_type, layer, color])
             count += 1
 
     return count
 
 
+def lisp_path_str(path):
+    """Return path as an absolute, forward-slash string for AutoLISP."""
+    return Path(path).resolve().as_posix()
+
+
 def create_script_file(lisp_path, csv_path, output_dwg, script_path, scale):
     """Create AcCoreConsole script file.
 
     Args:
-        lisp_path: Path to create_mleaders.lsp
-        csv_path: Path to labels CSV
-        output_dwg: Path for output DWG
+        lisp_path: create_mleaders.lsp as a lisp_path_str() string
+        csv_path: Labels CSV as a lisp_path_str() string
+        output_dwg: Output DWG as a lisp_path_str() string
         script_path: Path to write script file
         scale: Annotative scale factor (e.g., 40 for 1:40)
     """
-    # Convert paths to absolute and forward slashes for AutoLISP
-    lisp_path_str = str(lisp_path.resolve()).replace('\\', '/')
-    csv_path_str = str(csv_path.resolve()).replace('\\', '/')
-    output_dwg_str = str(output_dwg.resolve()).replace('\\', '/')
-
-    # Script uses SECURELOAD 0 to allow loading LISP from any path
-    # Then loads and runs the LISP script
-    script_content = f''';;; AcCoreConsole script for MLEADER batch creation
-;;; Disable SECURELOAD to allow LISP loading from any path
-(setvar "SECURELOAD" 0)
+    script_content = ACCORE_SCRIPT_TEMPLATE.format(
+        lisp_path=lisp_path,
+        csv_path=csv_path,
+        output_dwg=output_dwg,
+        scale=scale,
+    )
 
-;;; Load the LISP script
-(load "{lisp_path_str}")
+    with open(script_path, 'w') as f:
+        f.write(script_content)
 
-;;; Create the labels with specified scale
-(c:MLEADER-BATCH "{csv_path_str}" "{output_dwg_str}" {scale})
 
-;;; Exit
-(command "._QUIT" "_Yes")
-'''
+def _forward_lines(stream, dest):
+    """Copy a child process pipe to dest line by line until EOF."""
+    with stream:
+        for line in stream:
+            dest.write(line)
+            dest.flush()
 
-    with open(script_path, 'w') as f:
-        f.write(script_content)
+
+def _console_creationflags():
+    """Return Popen creationflags for launching AcCoreConsole.
+
+    From a terminal the child shares our console (0). When we have no console
+    (e.g. launched from a GUI host), CREATE_NO_WINDOW stops Windows from
+    allocating a new conhost window for it; output is piped either way.
+    """
+    if sys.platform != 'win32':
+        return 0
+    if ctypes.windll.kernel32.GetConsoleWindow():
+        return 0
+    return subprocess.CREATE_NO_WINDOW
 
 
 def run_accoreconsole(accore_path, template_dwg, script_path, timeout=300):
     """Run AcCoreConsole with template and script.
 
+    Console output is streamed to stderr while the process runs rather than
+    buffered until exit, so long batches show live progress.
+
     Args:
         accore_path: Path to accoreconsole.exe
         template_dwg: Path to template DWG file
@@ -156,7 +237,7 @@ def run_accoreconsole(accore_path, template_dwg, script_path, timeout=300):
         timeout: Maximum seconds to wait
 
     Returns:
-        (success, stdout, stderr)
+        (success, error) - error is an empty string on success
     """
     # AcCoreConsole arguments:
     # /i <drawing> - Input drawing to open
@@ -171,18 +252,37 @@ def run_accoreconsole(accore_path, template_dwg, script_path, timeout=300):
     print(f"Running: {' '.join(cmd)}", file=sys.stderr)
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=timeout,
-            cwd=str(template_dwg.parent)  # Set working directory
+            errors='replace',
+            bufsize=1,
+            cwd=str(template_dwg.parent),  # Set working directory
+            creationflags=_console_creationflags()
         )
-        return (result.returncode == 0, result.stdout, result.stderr)
-    except subprocess.TimeoutExpired:
-        return (False, "", "AcCoreConsole timed out")
     except Exception as e:
-        return (False, "", str(e))
+        return (False, str(e))
+
+    # Pipes can't be polled with select() on Windows, so drain on a thread
+    # and keep the main thread free to enforce the timeout
+    print("\n--- AcCoreConsole Output ---", file=sys.stderr)
+    reader = threading.Thread(target=_forward_lines, args=(proc.stdout, sys.stderr), daemon=True)
+    reader.start()
+
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        return (False, "AcCoreConsole timed out")
+    finally:
+        reader.join(timeout=5)
+
+    if returncode != 0:
+        return (False, f"AcCoreConsole exited with code {returncode}")
+    return (True, "")
 
 
 def create_manual_script(lisp_path, csv_path, output_dwg, script_path):
@@ -191,32 +291,16 @@ def create_manual_script(lisp_path, csv_path, output_dwg, script_path):
     This creates a .scr file that users can drag-drop into AutoCAD.
 
     Args:
-        lisp_path: Path to create_mleaders.lsp
-        csv_path: Path to labels CSV
-        output_dwg: Path for output DWG
+        lisp_path: create_mleaders.lsp as a lisp_path_str() string
+        csv_path: Labels CSV as a lisp_path_str() string
+        output_dwg: Output DWG as a lisp_path_str() string
         script_path: Path to write script file
     """
-    lisp_path_str = str(lisp_path).replace('\\', '/')
-    csv_path_str = str(csv_path).replace('\\', '/')
-    output_dwg_str = str(output_dwg).replace('\\', '/')
-
-    # SCR files use command-line syntax
-    script_content = f''';;; Manual script for MLEADER creation
-;;; Drag this file into AutoCAD with the template DWG open
-;;;
-;;; Steps:
-;;; 1. Open the template DWG in AutoCAD
-;;; 2. Drag this .scr file into the drawing window
-;;; 3. Wait for completion
-;;; 4. Check the output file location
-
-(load "{lisp_path_str}")
-(c:CREATE-MLEADERS "{csv_path_str}")
-_SAVEAS
-2018
-{output_dwg_str}
-
-'''
+    script_content = MANUAL_SCRIPT_TEMPLATE.format(
+        lisp_path=lisp_path,
+        csv_path=csv_path,
+        output_dwg=output_dwg,
+    )
 
     with open(script_path, 'w') as f:
         f.write(script_content)
@@ -289,6 +373,10 @@ def main():
         }))
         sys.exit(1)
 
+    # Resolve once; both the AcCoreConsole and manual scripts need these
+    lisp_str = lisp_path_str(LISP_SCRIPT)
+    output_str = lisp_path_str(output_path)
+
     # Create temp directory for intermediate files
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir = Path(tmpdir)
@@ -315,11 +403,11 @@ def main():
             manual_csv_path = output_path.with_name(output_path.stem + '-labels.csv')
 
             # Copy CSV to permanent location
-            import shutil
             shutil.copy(csv_path, manual_csv_path)
 
             # Create manual script
-            create_manual_script(LISP_SCRIPT, manual_csv_path, output_path, manual_script_path)
+            create_manual_script(lisp_str, lisp_path_str(manual_csv_path), output_str,
+                                 manual_script_path)
 
             print(f"\nManual mode: Scripts generated.", file=sys.stderr)
             print(f"  CSV file: {manual_csv_path}", file=sys.stderr)
@@ -350,31 +438,33 @@ def main():
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Create AcCoreConsole script
-        create_script_file(LISP_SCRIPT, csv_path, output_path, script_path, args.scale)
+        create_script_file(lisp_str, lisp_path_str(csv_path), output_str, script_path, args.scale)
 
         # Run AcCoreConsole with progress feedback
         estimated_time = 30 + label_count * 2  # Civil 3D load + ~2s per label
-        print(f"\n{'='*60}", file=sys.stderr)
-        print(f"Creating {label_count} MULTILEADER labels via AcCoreConsole...", file=sys.stderr)
-        print(f"{'='*60}", file=sys.stderr)
-        print(f"  Template: {template_path}", file=sys.stderr)
-        print(f"  Output: {output_path}", file=sys.stderr)
-        print(f"", file=sys.stderr)
-        print(f"  NOTE: Civil 3D/AutoCAD takes 30-60 seconds to load", file=sys.stderr)
-        print(f"        before processing begins. This is normal.", file=sys.stderr)
-        print(f"", file=sys.stderr)
-        print(f"  Estimated time: {estimated_time} seconds ({estimated_time // 60}m {estimated_time % 60}s)", file=sys.stderr)
-        print(f"  Please wait - DO NOT interrupt the process!", file=sys.stderr)
-        print(f"{'='*60}", file=sys.stderr)
-
-        success, stdout, stderr = run_accoreconsole(
+        # Single write so the banner reaches stderr in one flush
+        banner = [
+            f"\n{'='*60}",
+            f"Creating {label_count} MULTILEADER labels via AcCoreConsole...",
+            f"{'='*60}",
+            f"  Template: {template_path}",
+            f"  Output: {output_path}",
+            "",
+            "  NOTE: Civil 3D/AutoCAD takes 30-60 seconds to load",
+            "        before processing begins. This is normal.",
+            "",
+            f"  Estimated time: {estimated_time} seconds ({estimated_time // 60}m {estimated_time % 60}s)",
+            "  Please wait - DO NOT interrupt the process!",
+            f"{'='*60}",
+        ]
+        print("\n".join(banner), file=sys.stderr)
+
+        success, error = run_accoreconsole(
             accore_path, template_path, script_path, args.timeout
         )
 
-        if stdout:
-            print(f"\n--- AcCoreConsole Output ---\n{stdout}", file=sys.stderr)
-        if stderr:
-            print(f"\n--- AcCoreConsole Errors ---\n{stderr}", file=sys.stderr)
+        if error:
+            print(f"\n--- AcCoreConsole Errors ---\n{error}", file=sys.stderr)
 
         # Check for log file
         log_file = csv_path.parent / "create_mleaders.log"
@@ -399,9 +489,9 @@ def main():
             manual_script_path = output_path.with_suffix('.scr')
             manual_csv_path = output_path.with_name(output_path.stem + '-labels.csv')
 
-            import shutil
             shutil.copy(csv_path, manual_csv_path)
-            create_manual_script(LISP_SCRIPT, manual_csv_path, output_path, manual_script_path)
+            create_manual_script(lisp_str, lisp_path_str(manual_csv_path), output_str,
+                                 manual_script_path)
 
             print(json.dumps({
                 'success': False,
@@ -22,18 +22,28 @@
 ;;; CSV PARSING UTILITIES
 ;;; ============================================================================
 
-(defun csv-split (str delim / result current pos)
-  "Split string by delimiter character. Returns list of strings."
+(defun csv-split (str delim / result current pos char in-quotes)
+  "Split string by delimiter character, honoring double-quoted fields
+   (as written by Python's csv module). Returns list of strings."
   (setq result '()
         current ""
-        pos 0)
+        pos 0
+        in-quotes nil)
   (while (< pos (strlen str))
     (setq char (substr str (1+ pos) 1))
-    (if (= char delim)
-      (progn
-        (setq result (cons current result))
-        (setq current ""))
-      (setq current (strcat current char)))
+    (cond
+      ;; Doubled quote inside a quoted field is a literal quote
+      ((and in-quotes (= char "\"") (= (substr str (+ pos 2) 1) "\""))
+       (setq current (strcat current "\""))
+       (setq pos (1+ pos)))
+      ;; Opening or closing quote
+      ((= char "\"")
+       (setq in-quotes (not in-quotes)))
+      ((and (= char delim) (not in-quotes))
+       (setq result (cons current result))
+       (setq current ""))
+      (t
+       (setq current (strcat current char))))
     (setq pos (1+ pos)))
   ;; Add last field
   (setq result (cons current result))
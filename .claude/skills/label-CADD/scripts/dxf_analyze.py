@@ -5,61 +5,84 @@ import sys
 import json
 import argparse
 from collections import Counter, defaultdict
-import ezdxf
+import numpy as np
+from ezdxf.addons import iterdxf
+from dxf_common import load_doc, position_attr
 
 
-def analyze_structure(filepath):
-    """Analyze DXF file structure and return comprehensive statistics."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
+def tally_entities(entities):
+    """Count entities by type/layer and collect reference points for extents."""
+    combo = Counter()
+    points = []
 
-    by_type = defaultdict(int)
-    by_layer = defaultdict(int)
-    by_type_and_layer = defaultdict(lambda: defaultdict(int))
-
-    min_x = min_y = min_z = float('inf')
-    max_x = max_y = max_z = float('-inf')
-
-    for entity in msp:
+    for entity in entities:
         etype = entity.dxftype()
-        layer = entity.dxf.layer
-        by_type[etype] += 1
-        by_layer[layer] += 1
-        by_type_and_layer[layer][etype] += 1
+        combo[(etype, entity.dxf.layer)] += 1
 
         # Track extents
-        pt = None
-        if hasattr(entity.dxf, 'insert'):
-            pt = entity.dxf.insert
-        elif hasattr(entity.dxf, 'start'):
-            pt = entity.dxf.start
-        elif hasattr(entity.dxf, 'center'):
-            pt = entity.dxf.center
+        attr = position_attr(entity, etype)
+        pt = getattr(entity.dxf, attr) if attr else None
 
         if pt:
-            min_x, max_x = min(min_x, pt.x), max(max_x, pt.x)
-            min_y, max_y = min(min_y, pt.y), max(max_y, pt.y)
-            if hasattr(pt, 'z'):
-                min_z, max_z = min(min_z, pt.z), max(max_z, pt.z)
+            points.append((pt.x, pt.y, pt.z))
+
+    # Derive the three views from one (type, layer) counter; iterating it in
+    # insertion order keeps each view in first-appearance order.
+    by_type = Counter()
+    by_layer = Counter()
+    by_type_and_layer = defaultdict(Counter)
+    for (etype, layer), count in combo.items():
+        by_type[etype] += count
+        by_layer[layer] += count
+        by_type_and_layer[layer][etype] += count
+
+    return by_type, by_layer, by_type_and_layer, points
+
+
+def analyze_structure(filepath, streaming=False):
+    """Analyze DXF file structure and return comprehensive statistics.
+
+    With streaming=True, modelspace is read entity by entity through ezdxf's
+    iterdxf add-on instead of loading the whole document. Memory stays flat
+    on large files, but the header is not read ('header' is None) and entity
+    types ezdxf does not support (e.g. Civil 3D AECC_* proxies) are skipped.
+    """
+    if streaming:
+        doc = iterdxf.opendxf(filepath)
+        try:
+            version = doc.dxfversion
+            by_type, by_layer, by_type_and_layer, points = tally_entities(doc.modelspace())
+        finally:
+            doc.close()
+        header = None
+    else:
+        doc = load_doc(filepath)
+        version = doc.dxfversion
+        by_type, by_layer, by_type_and_layer, points = tally_entities(doc.modelspace())
+        header = {
+            'text_style': doc.header.get('$TEXTSTYLE', 'Standard'),
+            'dim_style': doc.header.get('$DIMSTYLE', 'Standard'),
+            'current_layer': doc.header.get('$CLAYER', '0')
+        }
+
+    # Reduce extents in one vectorized pass instead of per-entity min/max
+    if points:
+        coords = np.array(points, dtype=np.float64)
+        ext_min = coords.min(axis=0).tolist()
+        ext_max = coords.max(axis=0).tolist()
+    else:
+        ext_min = ext_max = [None, None, None]
 
     return {
-        'version': doc.dxfversion,
+        'version': version,
         'entity_counts': dict(by_type),
         'layer_counts': dict(by_layer),
         'by_type_and_layer': {k: dict(v) for k, v in by_type_and_layer.items()},
         'extents': {
-            'min': [min_x if min_x != float('inf') else None,
-                    min_y if min_y != float('inf') else None,
-                    min_z if min_z != float('inf') else None],
-            'max': [max_x if max_x != float('-inf') else None,
-                    max_y if max_y != float('-inf') else None,
-                    max_z if max_z != float('-inf') else None]
+            'min': ext_min,
+            'max': ext_max
         },
-        'header': {
-            'text_style': doc.header.get('$TEXTSTYLE', 'Standard'),
-            'dim_style': doc.header.get('$DIMSTYLE', 'Standard'),
-            'current_layer': doc.header.get('$CLAYER', '0')
-        }
+        'header': header
     }
 
 
@@ -67,9 +90,12 @@ def main():
     parser = argparse.ArgumentParser(description='Analyze DXF file structure')
     parser.add_argument('filepath', help='Path to DXF file')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Low-memory scan for large files (no header; '
+                             'skips unsupported/proxy entities such as AECC_*)')
     args = parser.parse_args()
 
-    result = analyze_structure(args.filepath)
+    result = analyze_structure(args.filepath, streaming=args.streaming)
 
     if args.json:
         print(json.dumps(result, indent=2))
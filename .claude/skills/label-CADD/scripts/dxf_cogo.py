@@ -1,30 +1,86 @@
 #!/usr/bin/env python3
 """Extract COGO points from DXF files (INSERT entities on survey layers)."""
 
+import os
+import re
 import sys
-import json
+import csv
+import fnmatch
 import argparse
-from fnmatch import fnmatch
-import ezdxf
+from ezdxf.addons import iterdxf
+from dxf_common import load_doc, write_json
 
+# Point keys written by --csv, in column order
+CSV_COLUMNS = ('layer', 'x', 'y', 'z', 'block', 'handle')
 
-def extract_cogo_points(filepath, layer_pattern='V-*'):
-    """Extract COGO points (INSERT entities) matching layer pattern."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
+
+def layer_matcher(layer_pattern):
+    """Return a predicate equivalent to fnmatch(layer, layer_pattern).
+
+    The glob is compiled once up front instead of going through fnmatch's
+    per-call normcase and cache lookup for every INSERT. The common
+    '<prefix>*' shape (e.g. the default 'V-*') becomes a plain startswith().
+    """
+    pattern = os.path.normcase(layer_pattern)
+    prefix = pattern[:-1]
+    if pattern.endswith('*') and not any(c in prefix for c in '*?['):
+        return lambda layer: os.path.normcase(layer).startswith(prefix)
+
+    match = re.compile(fnmatch.translate(pattern)).match
+    return lambda layer: match(os.path.normcase(layer)) is not None
+
+
+def attrib_pairs(insert):
+    """Yield (tag, text) for each ATTRIB attached to an INSERT."""
+    for attrib in insert.attribs:
+        dxf = attrib.dxf
+        yield dxf.tag, dxf.text
+
+
+def extract_cogo_points(filepath, layer_pattern='V-*', streaming=False, include_attrs=True):
+    """Extract COGO points (INSERT entities) matching layer pattern.
+
+    With streaming=True, INSERTs (and their ATTRIBs) are read one at a time
+    through ezdxf's iterdxf add-on instead of loading the whole document,
+    which keeps memory flat on large drawings. With include_attrs=False the
+    ATTRIBs are not read and points carry no 'attrs' key.
+    """
+    if streaming:
+        doc = iterdxf.opendxf(filepath)
+        try:
+            return collect_points(doc.modelspace(types=['INSERT']), layer_pattern, include_attrs)
+        finally:
+            doc.close()
+
+    doc = load_doc(filepath)
+    return collect_points(doc.modelspace(), layer_pattern, include_attrs)
+
+
+def collect_points(entities, layer_pattern, include_attrs=True):
+    """Build COGO point dicts from the INSERTs in entities on matching layers."""
+    layer_ok = layer_matcher(layer_pattern)
     points = []
 
-    for insert in msp.query('INSERT'):
-        if fnmatch(insert.dxf.layer, layer_pattern):
-            points.append({
-                'layer': insert.dxf.layer,
-                'x': insert.dxf.insert.x,
-                'y': insert.dxf.insert.y,
-                'z': insert.dxf.insert.z,
-                'block': insert.dxf.name,
-                'handle': insert.dxf.handle,
-                'attrs': {a.dxf.tag: a.dxf.text for a in insert.attribs} if insert.has_attrib else {}
-            })
+    # Iterate modelspace directly; msp.query() parses a selector string and
+    # builds an intermediate list of every INSERT before we see the first one
+    for insert in entities:
+        if insert.dxftype() != 'INSERT':
+            continue
+        dxf = insert.dxf
+        layer = dxf.layer
+        if layer_ok(layer):
+            pos = dxf.insert
+            point = {
+                'layer': layer,
+                'x': pos.x,
+                'y': pos.y,
+                'z': pos.z,
+                'block': dxf.name,
+                'handle': dxf.handle,
+            }
+            if include_attrs:
+                point['attrs'] = dict(attrib_pairs(insert))
+            points.append(point)
     return points
 
 
@@ -34,16 +90,21 @@ def main():
     parser.add_argument('--layer', default='V-*', help='Layer pattern (default: V-*)')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
     parser.add_argument('--csv', action='store_true', help='Output as CSV')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Low-memory scan for large files (reads INSERTs one at a time)')
     args = parser.parse_args()
 
-    points = extract_cogo_points(args.filepath, args.layer)
+    # The CSV columns don't include ATTRIBs, so skip reading them there
+    points = extract_cogo_points(args.filepath, args.layer, streaming=args.streaming,
+                                 include_attrs=args.json or not args.csv)
 
     if args.json:
-        print(json.dumps(points, indent=2))
+        write_json(points)
     elif args.csv:
-        print("layer,x,y,z,block,handle")
-        for p in points:
-            print(f"{p['layer']},{p['x']},{p['y']},{p['z']},{p['block']},{p['handle']}")
+        # csv.writer quotes layer/block names that contain commas or quotes
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows([p[key] for key in CSV_COLUMNS] for p in points)
     else:
         print(f"Found {len(points)} COGO points matching '{args.layer}':\n")
         for p in points:
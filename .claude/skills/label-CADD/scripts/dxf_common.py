@@ -0,0 +1,46 @@
+"""Helpers shared by the label-CADD DXF scripts.
+
+Not a standalone script: the scripts import it from their own directory,
+which Python puts on sys.path when one of them is run.
+"""
+
+import sys
+import json
+import ezdxf
+from ezdxf import recover
+
+# Reference-point attributes probed in order; the first one an entity type
+# supports is cached per dxftype() so hasattr() runs once per type.
+POSITION_ATTRS = ('insert', 'start', 'center')
+_position_attr_by_type = {}
+
+
+def load_doc(filepath):
+    """Read a DXF with the fast loader, recovering only if it is malformed."""
+    try:
+        return ezdxf.readfile(filepath)
+    except ezdxf.DXFStructureError:
+        print(f"Warning: {filepath} is malformed; loading in recover mode", file=sys.stderr)
+        doc, auditor = recover.readfile(filepath)
+        return doc
+
+
+def position_attr(entity, etype):
+    """Return the name of the entity's reference-point attribute, or None."""
+    try:
+        return _position_attr_by_type[etype]
+    except KeyError:
+        attr = next((a for a in POSITION_ATTRS if hasattr(entity.dxf, a)), None)
+        _position_attr_by_type[etype] = attr
+        return attr
+
+
+def write_json(obj):
+    """Write obj to stdout as indented JSON.
+
+    json.dump streams the encoder's chunks to stdout instead of building the
+    whole document as one string first. Non-ASCII text stays \\u-escaped, so
+    the output encodes on any console code page.
+    """
+    json.dump(obj, sys.stdout, indent=2)
+    sys.stdout.write('\n')
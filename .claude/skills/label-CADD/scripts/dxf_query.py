@@ -1,121 +1,303 @@
 #!/usr/bin/env python3
 """Query utilities for DXF files."""
 
+import os
+import re
 import sys
+import stat
+import time
 import json
+import hashlib
 import argparse
-from fnmatch import fnmatch
-import ezdxf
+import tempfile
+import zipfile
+import fnmatch
+from pathlib import Path
+import numpy as np
+from ezdxf.math import Vec2, Vec3
+from dxf_common import load_doc, position_attr
+
+# Per-file entity index (handle/type/layer/position arrays), cached outside
+# the project folder and keyed by the DXF's path, mtime and size, so
+# repeated queries against the same drawing skip the ezdxf parse. The cache
+# directory is private to the current user (the shared temp dir on POSIX is
+# world-writable, so another user could otherwise plant index files), and
+# entries unused for INDEX_MAX_AGE seconds are pruned.
+INDEX_VERSION = 3
+INDEX_DIR = Path(tempfile.gettempdir()) / (
+    f'label-CADD-index-{os.getuid()}' if hasattr(os, 'getuid') else 'label-CADD-index')
+INDEX_MAX_AGE = 7 * 24 * 3600
+INDEX_FIELDS = ('handles', 'types', 'layer_names', 'layer_codes', 'pos', 'has_pos',
+                'x_order', 'x_sorted')
+
+# Structural entities that name modelspace as their owner but are never
+# yielded by iterating it: each POLYLINE's and attributed INSERT's closing
+# SEQEND, plus the *Model_Space block record's BLOCK/ENDBLK markers.
+NON_MSP_TYPES = frozenset(('SEQEND', 'BLOCK', 'ENDBLK'))
+
+# Plain entity names can be answered from the index; anything else
+# ('*', '!LINE', attribute selectors) goes through ezdxf's query parser.
+PLAIN_TYPE = re.compile(r'\w+$')
+
+
+def build_index(filepath):
+    """Scan modelspace once into parallel numpy arrays."""
+    doc = load_doc(filepath)
+    handles, types, layers, coords, has_pos = [], [], [], [], []
+
+    for entity in doc.modelspace():
+        # Bind the DXF namespace once; each entity.dxf is a property lookup
+        dxf = entity.dxf
+        etype = entity.dxftype()
+        handles.append(dxf.handle)
+        types.append(etype)
+        layers.append(dxf.layer)
+
+        attr = position_attr(entity, etype)
+        pt = getattr(dxf, attr) if attr else None
+        if pt:
+            coords.append((pt.x, pt.y, pt.z if hasattr(pt, 'z') else 0))
+            has_pos.append(True)
+        else:
+            coords.append((0.0, 0.0, 0.0))
+            has_pos.append(False)
+
+    pos = np.array(coords, dtype=np.float64).reshape(-1, 3)
+    has_pos = np.array(has_pos, dtype=bool)
+
+    # Positioned rows sorted by X, so spatial queries can binary-search an
+    # X window instead of testing every entity
+    positioned = np.flatnonzero(has_pos)
+    x_order = positioned[np.argsort(pos[positioned, 0], kind='stable')]
+
+    # Layers are stored as codes into the distinct names, so layer queries
+    # match each name once and then compare small integers per entity
+    layer_names, layer_codes = np.unique(np.array(layers, dtype=str), return_inverse=True)
+
+    return {
+        'handles': np.array(handles, dtype=str),
+        'types': np.array(types, dtype=str),
+        'layer_names': layer_names,
+        'layer_codes': layer_codes.reshape(-1).astype(np.int32),
+        'pos': pos,
+        'has_pos': has_pos,
+        'x_order': x_order,
+        'x_sorted': pos[x_order, 0],
+    }
+
+
+def private_index_dir():
+    """Create INDEX_DIR if needed; return True only if it is safe to use.
+
+    The directory must be a real directory (not a symlink) and, on POSIX,
+    owned by the current user with no group/other permissions.
+    """
+    try:
+        INDEX_DIR.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(INDEX_DIR)
+        if not stat.S_ISDIR(st.st_mode):
+            return False
+        if hasattr(os, 'getuid'):
+            if st.st_uid != os.getuid():
+                return False
+            if st.st_mode & 0o077:
+                os.chmod(INDEX_DIR, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+def prune_index_dir(keep):
+    """Delete cache entries (and abandoned temp files) older than INDEX_MAX_AGE."""
+    cutoff = time.time() - INDEX_MAX_AGE
+    for entry in os.scandir(INDEX_DIR):
+        try:
+            if entry.name != keep and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def read_cached_index(cache_path, stamp):
+    """Return the cached index if its stamp matches, else None."""
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if not np.array_equal(cached['stamp'], stamp):
+                return None
+            index = {field: cached[field] for field in INDEX_FIELDS}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    try:
+        os.utime(cache_path)  # Mark as recently used so pruning keeps it
+    except OSError:
+        pass
+    return index
+
+
+def load_index(filepath):
+    """Return the entity index for filepath, rebuilding it if the DXF changed."""
+    st = os.stat(filepath)
+    stamp = np.array([INDEX_VERSION, st.st_mtime_ns, st.st_size], dtype=np.int64)
+    if not private_index_dir():
+        return build_index(filepath)  # No trustworthy cache; just parse
+
+    key = hashlib.sha1(str(Path(filepath).resolve()).encode('utf-8')).hexdigest()
+    cache_path = INDEX_DIR / f"{key}.npz"
+
+    index = read_cached_index(cache_path, stamp)
+    if index is not None:
+        return index
+
+    index = build_index(filepath)
+    try:
+        # mkstemp picks an unpredictable name and opens it O_EXCL, so a
+        # planted file or symlink cannot be written through
+        fd, tmp_path = tempfile.mkstemp(dir=INDEX_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, stamp=stamp, **index)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        prune_index_dir(keep=cache_path.name)
+    except OSError:
+        pass  # Caching is best-effort; the query result is unaffected
+    return index
+
+
+def index_rows(index, idx):
+    """Build the type/layer/handle result dicts for the given index rows."""
+    return [
+        {'type': etype, 'layer': layer, 'handle': handle}
+        for etype, layer, handle in zip(index['types'][idx].tolist(),
+                                        index['layer_names'][index['layer_codes'][idx]].tolist(),
+                                        index['handles'][idx].tolist())
+    ]
+
+
+def rows_in_x_range(index, min_x, max_x):
+    """Return positioned rows with min_x <= x <= max_x, in modelspace order."""
+    x_sorted = index['x_sorted']
+    lo = np.searchsorted(x_sorted, min_x, side='left')
+    hi = np.searchsorted(x_sorted, max_x, side='right')
+    return np.sort(index['x_order'][lo:hi])
 
 
 def query_by_layer_pattern(filepath, layer_pattern):
     """Query entities matching layer pattern."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
-    results = []
+    index = load_index(filepath)
 
-    for entity in msp:
-        if fnmatch(entity.dxf.layer, layer_pattern):
-            results.append({
-                'type': entity.dxftype(),
-                'layer': entity.dxf.layer,
-                'handle': entity.dxf.handle
-            })
-    return results
+    # Names that lack the glob's literal prefix are rejected with a cheap
+    # startswith(); the compiled glob runs only on the rest. normcase keeps
+    # fnmatch's case rules per OS.
+    pattern = os.path.normcase(layer_pattern)
+    prefix = re.split(r'[*?[]', pattern, maxsplit=1)[0]
+    match = re.compile(fnmatch.translate(pattern)).match
+
+    matched_codes = []
+    for code, name in enumerate(index['layer_names'].tolist()):
+        key = os.path.normcase(name)
+        if key.startswith(prefix) and match(key):
+            matched_codes.append(code)
+    idx = np.flatnonzero(np.isin(index['layer_codes'], matched_codes))
+    return index_rows(index, idx)
 
 
 def query_by_type(filepath, entity_types):
     """Query entities by type (e.g., 'LINE', 'CIRCLE', 'ARC')."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
-
     if isinstance(entity_types, str):
         entity_types = entity_types.split()
 
+    if entity_types and all(PLAIN_TYPE.match(t) for t in entity_types):
+        index = load_index(filepath)
+        wanted = [t.upper() for t in entity_types]
+        idx = np.flatnonzero(np.isin(index['types'], wanted))
+        return index_rows(index, idx)
+
+    doc = load_doc(filepath)
+    msp = doc.modelspace()
+
     query_str = ' '.join(entity_types)
     results = []
     for entity in msp.query(query_str):
+        dxf = entity.dxf
         results.append({
             'type': entity.dxftype(),
-            'layer': entity.dxf.layer,
-            'handle': entity.dxf.handle
+            'layer': dxf.layer,
+            'handle': dxf.handle
         })
     return results
 
 
 def query_in_bbox(filepath, min_x, min_y, max_x, max_y):
     """Query entities within bounding box."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
-    results = []
+    index = load_index(filepath)
+    pos = index['pos']
 
-    for entity in msp:
-        pt = None
-        if hasattr(entity.dxf, 'insert'):
-            pt = entity.dxf.insert
-        elif hasattr(entity.dxf, 'start'):
-            pt = entity.dxf.start
-        elif hasattr(entity.dxf, 'center'):
-            pt = entity.dxf.center
-
-        if pt and min_x <= pt.x <= max_x and min_y <= pt.y <= max_y:
-            results.append({
-                'type': entity.dxftype(),
-                'layer': entity.dxf.layer,
-                'handle': entity.dxf.handle,
-                'position': [pt.x, pt.y, pt.z if hasattr(pt, 'z') else 0]
-            })
+    idx = rows_in_x_range(index, min_x, max_x)
+    y = pos[idx, 1]
+    idx = idx[(y >= min_y) & (y <= max_y)]
+
+    results = index_rows(index, idx)
+    for row, position in zip(results, pos[idx].tolist()):
+        row['position'] = position
     return results
 
 
 def get_entity_by_handle(filepath, handle):
     """Get entity details by handle."""
-    doc = ezdxf.readfile(filepath)
+    doc = load_doc(filepath)
     msp = doc.modelspace()
 
-    for entity in msp:
-        if entity.dxf.handle == handle:
-            attrs = dict(entity.dxf.all_existing_dxf_attribs())
-            # Convert Vec3 objects to lists for JSON serialization
-            for k, v in attrs.items():
-                if hasattr(v, 'x') and hasattr(v, 'y'):
-                    attrs[k] = [v.x, v.y, v.z if hasattr(v, 'z') else 0]
-            return {
-                'type': entity.dxftype(),
-                'layer': entity.dxf.layer,
-                'handle': handle,
-                'attributes': attrs
-            }
-    return None
+    # O(1) handle lookup; the entity database also holds table, block and
+    # object entries, so only accept entities that iterating modelspace
+    # would yield: owned by it and not one of its structural markers.
+    entity = doc.entitydb.get(handle)
+    if (entity is None or entity.dxf.get('owner') != msp.layout_key
+            or entity.dxftype() in NON_MSP_TYPES):
+        return None
+
+    # Convert Vec2/Vec3 objects to lists for JSON serialization
+    attrs = {
+        k: ([v.x, v.y, v.z if isinstance(v, Vec3) else 0] if isinstance(v, (Vec2, Vec3)) else v)
+        for k, v in entity.dxf.all_existing_dxf_attribs().items()
+    }
+    return {
+        'type': entity.dxftype(),
+        'layer': entity.dxf.layer,
+        'handle': handle,
+        'attributes': attrs
+    }
 
 
 def find_near_point(filepath, x, y, tolerance=10):
     """Find entities near a point."""
-    doc = ezdxf.readfile(filepath)
-    msp = doc.modelspace()
-    results = []
-
-    for entity in msp:
-        pt = None
-        if hasattr(entity.dxf, 'insert'):
-            pt = entity.dxf.insert
-        elif hasattr(entity.dxf, 'start'):
-            pt = entity.dxf.start
-        elif hasattr(entity.dxf, 'center'):
-            pt = entity.dxf.center
-
-        if pt:
-            dist = ((pt.x - x)**2 + (pt.y - y)**2)**0.5
-            if dist <= tolerance:
-                results.append({
-                    'type': entity.dxftype(),
-                    'layer': entity.dxf.layer,
-                    'handle': entity.dxf.handle,
-                    'distance': dist,
-                    'position': [pt.x, pt.y, pt.z if hasattr(pt, 'z') else 0]
-                })
-
-    return sorted(results, key=lambda r: r['distance'])
+    index = load_index(filepath)
+    pos = index['pos']
+
+    idx = rows_in_x_range(index, x - tolerance, x + tolerance)
+    # Distances use the same float ** arithmetic as a per-entity loop, since
+    # np.hypot/np.sqrt can round differently in the last digit and flip a
+    # point lying exactly on the tolerance boundary. Only rows inside the
+    # X window get here, so the Python-level loop stays short.
+    dist = np.array([(dx ** 2 + dy ** 2) ** 0.5
+                     for dx, dy in zip((pos[idx, 0] - x).tolist(), (pos[idx, 1] - y).tolist())],
+                    dtype=float)
+    keep = dist <= tolerance
+    idx, dist = idx[keep], dist[keep]
+    # Stable sort keeps modelspace order among equal distances
+    order = np.argsort(dist, kind='stable')
+    idx, dist = idx[order], dist[order]
+
+    results = index_rows(index, idx)
+    for row, d, position in zip(results, dist.tolist(), pos[idx].tolist()):
+        row['distance'] = d
+        row['position'] = position
+    return results
 
 
 def main():
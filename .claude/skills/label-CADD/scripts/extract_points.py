@@ -2,8 +2,12 @@
 """
 Extract survey points with "/" in descriptions from DXF file.
 Outputs JSON for Claude to analyze and make labeling decisions.
+
+DXFs are opened with ezdxf's fast loader; recover mode (slower, tolerant of
+damaged files) is used only when that fails with a structure error.
 """
 
+import gc
 import sys
 import json
 import argparse
@@ -16,6 +20,8 @@ except ImportError:
     print("Error: ezdxf library not installed. Run: pip install ezdxf", file=sys.stderr)
     sys.exit(1)
 
+from dxf_common import load_doc, write_json
+
 
 def extract_points_with_slash(doc):
     """Extract all points with '/' in their description from anonymous blocks."""
@@ -25,8 +31,14 @@ def extract_points_with_slash(doc):
         if not block.name.startswith('*U'):
             continue
 
-        entities = list(block)
-        mtexts = [e for e in entities if e.dxftype() == 'MTEXT']
+        # Only the first three MTEXTs (elevation, point number, description)
+        # are used, so stop scanning the block once they are found
+        mtexts = []
+        for e in block:
+            if e.dxftype() == 'MTEXT':
+                mtexts.append(e)
+                if len(mtexts) == 3:
+                    break
 
         if len(mtexts) < 3:
             continue
@@ -39,19 +51,20 @@ def extract_points_with_slash(doc):
             if not all([elev_text, pnum_text, desc_text]):
                 continue
 
-            if '/' not in desc_text:
+            # Parse code and comment; partition() returns the pieces as a
+            # tuple in one call, and sep is empty when there is no '/'
+            description = desc_text.strip()
+            head, sep, tail = description.partition('/')
+            if not sep:
                 continue
-
-            # Parse code and comment
-            parts = desc_text.split('/', 1)
-            code = parts[0].strip().upper()
-            comment = parts[1].strip() if len(parts) > 1 else ""
+            code = head.strip().upper()
+            comment = tail.strip()
 
             points.append({
                 'block_name': block.name,
                 'point_num': pnum_text.strip(),
                 'elevation': elev_text.strip(),
-                'description': desc_text.strip(),
+                'description': description,
                 'code': code,
                 'comment': comment
             })
@@ -64,34 +77,47 @@ def extract_points_with_slash(doc):
 def find_insert_positions(doc, block_names):
     """Find the positions of INSERT entities that reference the given block names."""
     msp = doc.modelspace()
+    block_names = frozenset(block_names)
     positions = {}
-
-    for insert in msp.query('INSERT'):
-        block_name = insert.dxf.name
-        if block_name in block_names:
-            pos = insert.dxf.insert
+    if not block_names:
+        return positions
+
+    # Each *U block is inserted once, so take the first INSERT per name and
+    # stop walking modelspace as soon as every wanted block has been found.
+    # Iterate msp lazily; msp.query() would build the full INSERT list first.
+    for insert in msp:
+        if insert.dxftype() != 'INSERT':
+            continue
+        dxf = insert.dxf
+        block_name = dxf.name
+        if block_name in block_names and block_name not in positions:
+            pos = dxf.insert
             positions[block_name] = {'x': pos.x, 'y': pos.y, 'z': pos.z}
+            if len(positions) == len(block_names):
+                break
 
     return positions
 
 
 def find_mleader_style(doc):
     """Find the 'Annotative Simplex' style or fall back to first available."""
-    # mleader_styles returns tuples of (name, style_object)
-    style_names = [name for name, _ in doc.mleader_styles]
+    fallback = None
 
-    # Look for Annotative Simplex (may have hyphen or space)
-    for name in style_names:
-        if 'annotative' in name.lower() and 'simplex' in name.lower():
-            return name
+    # mleader_styles returns tuples of (name, style_object); one pass, lowering
+    # each name once
+    for name, _ in doc.mleader_styles:
+        low = name.lower()
 
-    # Fall back to first non-Standard style
-    for name in style_names:
-        if name.lower() != 'standard':
+        # Look for Annotative Simplex (may have hyphen or space)
+        if 'annotative' in low and 'simplex' in low:
             return name
 
+        # Remember the first non-Standard style as the fallback
+        if fallback is None and low != 'standard':
+            fallback = name
+
     # Last resort: Standard
-    return 'Standard'
+    return fallback if fallback is not None else 'Standard'
 
 
 def main():
@@ -108,10 +134,18 @@ def main():
         sys.exit(1)
 
     try:
-        doc = ezdxf.readfile(str(input_path))
+        doc = load_doc(str(input_path))
 
-        # Extract points
-        points = extract_points_with_slash(doc)
+        # Extract points. The loop only builds plain dicts and strings (no
+        # reference cycles), so pause the cyclic GC instead of letting it
+        # rescan the growing list on every allocation threshold
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            points = extract_points_with_slash(doc)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
         # Find positions
         block_names = set(p['block_name'] for p in points)
@@ -135,7 +169,7 @@ def main():
             'points': points
         }
 
-        print(json.dumps(result, indent=2))
+        write_json(result)
 
     except Exception as e:
         print(json.dumps({'error': str(e)}))
@@ -8,6 +8,7 @@ import sys
 import json
 import csv
 import argparse
+import itertools
 from pathlib import Path
 
 
@@ -46,59 +47,58 @@ def parse_csv_pnezd(file_path, filter_slash=True):
         delimiter = detect_delimiter(first_line)
         f.seek(0)
 
+        # Stream rows; only the first one is needed up front for the header check
         reader = csv.reader(f, delimiter=delimiter)
-        rows = list(reader)
+        first_row = next(reader, None)
+        if first_row is None:
+            return points, ["Empty CSV file"]
 
-    if not rows:
-        return points, ["Empty CSV file"]
-
-    # Skip header if present
-    start_idx = 1 if is_header_row(rows[0]) else 0
-
-    for i, row in enumerate(rows[start_idx:], start=start_idx + 1):
-        if len(row) < 5:
-            errors.append(f"Row {i}: Expected 5 columns (PNEZD), got {len(row)}")
-            continue
-
-        point_num, northing, easting, elevation, description = row[0], row[1], row[2], row[3], row[4]
-
-        # Validate numeric fields
-        try:
-            n = float(northing)
-            e = float(easting)
-            z = float(elevation)
-        except ValueError as ex:
-            errors.append(f"Row {i}: Invalid numeric value - {ex}")
-            continue
-
-        description = description.strip()
-
-        # Filter for "/" in description if requested
-        if filter_slash and '/' not in description:
-            continue
-
-        # Parse code and comment
-        if '/' in description:
-            parts = description.split('/', 1)
-            code = parts[0].strip().upper()
-            comment = parts[1].strip() if len(parts) > 1 else ""
+        if is_header_row(first_row):
+            rows, start = reader, 2
         else:
-            code = description.upper()
-            comment = ""
-
-        points.append({
-            'block_name': None,  # No DXF block for CSV input
-            'point_num': point_num.strip(),
-            'elevation': elevation.strip(),
-            'description': description,
-            'code': code,
-            'comment': comment,
-            'position': {
-                'x': e,  # Easting = X
-                'y': n,  # Northing = Y
-                'z': z   # Elevation = Z
-            }
-        })
+            rows, start = itertools.chain([first_row], reader), 1
+
+        for i, row in enumerate(rows, start=start):
+            if len(row) < 5:
+                errors.append(f"Row {i}: Expected 5 columns (PNEZD), got {len(row)}")
+                continue
+
+            point_num, northing, easting, elevation, description = row[0], row[1], row[2], row[3], row[4]
+
+            # Validate numeric fields
+            try:
+                n = float(northing)
+                e = float(easting)
+                z = float(elevation)
+            except ValueError as ex:
+                errors.append(f"Row {i}: Invalid numeric value - {ex}")
+                continue
+
+            description = description.strip()
+            head, sep, tail = description.partition('/')
+
+            # Filter for "/" in description if requested
+            if filter_slash and not sep:
+                continue
+
+            # Parse code and comment; without a '/', head is the whole
+            # description and tail is empty
+            code = head.strip().upper()
+            comment = tail.strip()
+
+            points.append({
+                'block_name': None,  # No DXF block for CSV input
+                'point_num': point_num.strip(),
+                'elevation': elevation.strip(),
+                'description': description,
+                'code': code,
+                'comment': comment,
+                'position': {
+                    'x': e,  # Easting = X
+                    'y': n,  # Northing = Y
+                    'z': z   # Elevation = Z
+                }
+            })
 
     return points, errors
 